@@ -1,8 +1,22 @@
+import os
+
 import uvicorn
+
+from src.application.services.env_service import load_env
+
+# Load .env once, before the app (and modules that read env at import) is imported.
+load_env()
+
 from src.api.app import app
 from src.infrastructure.logging_config import setup_colored_logging
+from src.infrastructure.server import SERVER_KWARGS
+
+# Entry point for both `python asgi.py` and `gunicorn asgi:app`, so logging is
+# configured here, once, rather than as a side effect of importing the app.
+setup_colored_logging()
 
+# Single-process dev server. Production runs `gunicorn asgi:app` (see gunicorn.conf.py).
 if __name__ == "__main__":
-    setup_colored_logging()
-    
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None, access_log=True, server_header=False)
\ No newline at end of file
+    # Per-request access log lines are opt-in (ACCESS_LOG=true); they cost a format + write per hit.
+    access_log = os.getenv("ACCESS_LOG", "false").lower() == "true"
+    uvicorn.run("src.api.app:app", host="0.0.0.0", port=8000, log_config=None, access_log=access_log, **SERVER_KWARGS)
@@ -0,0 +1,24 @@
+"""Gunicorn settings for production: a small pool of Uvicorn workers.
+
+`python asgi.py` stays the single-process dev server; containers run
+`gunicorn asgi:app`, which picks this file up automatically. Set
+`WEB_CONCURRENCY` to size the pool to the container's CPU quota.
+"""
+
+import os
+
+bind = "0.0.0.0:8000"
+# Same server settings as the dev server (src/infrastructure/server.py).
+worker_class = "src.infrastructure.gunicorn_worker.UvicornWorker"
+# Not os.cpu_count(): in a container that reports the host's CPUs, not the
+# cgroup quota.
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+# Import the app once in the master so workers fork with it already loaded.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Split the in-memory rate limits by the worker count Gunicorn actually runs
+    # (`-w` on the command line included); see src/api/rate_limit.py.
+    from src.api.rate_limit import set_worker_shares
+    set_worker_shares(server.cfg.workers)
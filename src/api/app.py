@@ -1,8 +1,14 @@
+import asyncio
+import functools
+import gzip
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
@@ -14,35 +20,54 @@ from src.api.controllers import (
     mobile_proxy_controller,
     web_session_controller,
 )
-from src.api.middleware.sentry_middleware import SentryMiddleware, SentryAsyncContextMiddleware
+from src.api.middleware.gzip_middleware import SelectiveGZipMiddleware
 from src.api.rate_limit import shared_limiter, shared_rate_limit_exceeded_handler
 from src.application.services.app_config_service import app_config
-from src.application.services.env_service import load_env
-from src.infrastructure.logging_config import setup_colored_logging
+from src.infrastructure.http_client import close_shared_transport, shared_transport
 from src.infrastructure.monitoring import initialize_sentry
 
-setup_colored_logging()
+# application.properties is read once at import; resolve the values used below once too.
+_APP_VERSION = app_config.get_version()
+_APP_ENVIRONMENT = app_config.get_environment()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Process startup/shutdown. Runs once per worker, after the event loop is up,
+    so importing the app (tests, the Gunicorn master) stays free of side effects."""
+    # Coroutines that finish without suspending (most dependency/middleware steps)
+    # complete inline instead of round-tripping through the loop. Python 3.12+.
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+    # Initialize Sentry/GlitchTip monitoring
+    initialize_sentry(
+        dsn=os.getenv("SENTRY_DSN"),
+        environment=_APP_ENVIRONMENT,
+        release=_APP_VERSION,
+        debug=app_config.is_debug(),
+        traces_sample_rate=0.1
+    )
 
-load_env()
+    # The route table is final once the app is up: build the /openapi.json bodies
+    # now rather than on the first docs hit.
+    _openapi_bodies()
 
-# Initialize Sentry/GlitchTip monitoring
-initialize_sentry(
-    dsn=os.getenv("SENTRY_DSN"),
-    environment=app_config.get_environment(),
-    release=app_config.get_version(),
-    debug=app_config.is_debug(),
-    traces_sample_rate=0.1
-)
+    # Build the upstream connection pool now (SSL context + CA bundle load, h2
+    # import) so the first login/scrape doesn't pay for it.
+    shared_transport()
+    yield
+
+    await close_shared_transport()
 
 def _custom_operation_id(route: APIRoute) -> str:
     """Generate operationIds as kebab-joined path segments after `/api/`.
 
     Example: `/api/app/app-info` -> `app-app-info`.
     """
-    parts = route.path.strip("/").split("/")
-    if parts and parts[0] == "api":
-        parts = parts[1:]
-    return "-".join(parts) if parts else "root"
+    path = route.path.strip("/")
+    if path == "api":
+        return "root"
+    return path.removeprefix("api/").replace("/", "-")
 
 _API_DESCRIPTION = f"""
 Wraps Schulnetz to provide a unified and easy-to-use REST API.
@@ -64,69 +89,104 @@ decides per request.
 The only exception is `POST /api/authenticate/login`, which carries the base
 URL as a `schulnetz_base_url` field in its JSON body instead.
 
-**Environment:** {app_config.get_environment()}
+**Environment:** {_APP_ENVIRONMENT}
 """.strip()
 
 app = FastAPI(
     title="SchulwareAPI",
     description=_API_DESCRIPTION,
-    version=app_config.get_version(),
+    version=_APP_VERSION,
     redoc_url=None,
     docs_url=None,  # custom docs route below wires up the favicon
+    openapi_url=None,  # served from precomputed bytes below
+    default_response_class=ORJSONResponse,  # orjson encodes in C, straight to bytes
     generate_unique_id_function=_custom_operation_id,
+    lifespan=lifespan,
 )
 
 # Static assets (icon.svg, manifest, favicons)
 _ASSETS_DIR = Path(__file__).resolve().parents[2] / "assets"
 app.mount("/assets", StaticFiles(directory=_ASSETS_DIR), name="assets")
 
+_OPENAPI_URL = "/openapi.json"
+
+@functools.cache
+def _openapi_bodies() -> tuple[bytes, bytes]:
+    """The schema as plain and gzipped JSON bytes, built once on first use."""
+    body = orjson.dumps(app.openapi())
+    return body, gzip.compress(body, compresslevel=9)
+
+@app.get(_OPENAPI_URL, include_in_schema=False)
+async def openapi_json(request: Request) -> Response:
+    # Serve the pre-gzipped body directly; GZipMiddleware leaves responses that
+    # already carry a Content-Encoding alone instead of recompressing them.
+    body, gzipped = _openapi_bodies()
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(content=gzipped, media_type="application/json", headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    return Response(content=body, media_type="application/json", headers={"Vary": "Accept-Encoding"})
+
+# The docs page never changes either; render it once instead of per request.
+_SWAGGER_UI_HTML = get_swagger_ui_html(
+    openapi_url=_OPENAPI_URL,
+    title=f"{app.title} - Docs",
+    swagger_favicon_url="/assets/icon.svg",
+).body
+
 @app.get("/", include_in_schema=False)
-def swagger_ui():
-    return get_swagger_ui_html(
-        openapi_url=app.openapi_url,
-        title=f"{app.title} - Docs",
-        swagger_favicon_url="/assets/icon.svg",
-    )
+async def swagger_ui() -> HTMLResponse:
+    return HTMLResponse(_SWAGGER_UI_HTML)
+
+# Compress JSON bodies (grades, timetables) above 1 KiB; tiny responses aren't worth the CPU.
+# File downloads are streamed through as the school sent them.
+app.add_middleware(SelectiveGZipMiddleware, excluded_paths={"/api/websession/download"}, minimum_size=1024, compresslevel=5)
+
+# Sentry middleware for enhanced error tracking. Without a DSN nothing would be sent,
+# so skip the two per-request middleware frames entirely.
+if os.getenv("SENTRY_DSN"):
+    from src.api.middleware.sentry_middleware import SentryMiddleware, SentryAsyncContextMiddleware
 
-# Sentry middleware for enhanced error tracking
-app.add_middleware(SentryMiddleware)
-app.add_middleware(SentryAsyncContextMiddleware)
+    app.add_middleware(SentryMiddleware)
+    app.add_middleware(SentryAsyncContextMiddleware)
 
 # Rate limiting
 app.state.limiter = shared_limiter
 app.add_exception_handler(RateLimitExceeded, shared_rate_limit_exceeded_handler)
 
-# Routers
-app.include_router(app_controller.router)
-app.include_router(auth_controller.router)
-app.include_router(mobile_proxy_controller.router)
-app.include_router(web_session_controller.router)
+# Routers. Each controller router is already flat (the controller decorator folds
+# its class routes in once), so the app includes every router exactly once.
+for _controller in (app_controller, auth_controller, mobile_proxy_controller, web_session_controller):
+    app.include_router(_controller.router)
 
 def _flatten_any_of_nullable(obj):
-    if isinstance(obj, dict):
-        if "anyOf" in obj and isinstance(obj["anyOf"], list) and len(obj["anyOf"]) == 2:
-            types = obj["anyOf"]
-            null_type = next((t for t in types if t.get("type") == "null"), None)
-            real_type = next((t for t in types if t.get("type") != "null"), None)
-            if null_type and real_type is not None:
-                obj.pop("anyOf")
-                obj["nullable"] = True
-                if "$ref" in real_type:
-                    obj["$ref"] = real_type["$ref"]
-                elif "type" in real_type:
-                    obj["type"] = real_type["type"]
-                    for k, v in real_type.items():
-                        if k != "type":
-                            obj[k] = v
-                return obj
-        for v in obj.values():
-            _flatten_any_of_nullable(v)
-    elif isinstance(obj, list):
-        for item in obj:
-            _flatten_any_of_nullable(item)
+    # Explicit work stack instead of recursion: no frame per schema node, no depth limit.
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            types = node.get("anyOf")
+            if isinstance(types, list) and len(types) == 2:
+                null_type = next((t for t in types if t.get("type") == "null"), None)
+                real_type = next((t for t in types if t.get("type") != "null"), None)
+                if null_type and real_type is not None:
+                    node.pop("anyOf")
+                    node["nullable"] = True
+                    if "$ref" in real_type:
+                        node["$ref"] = real_type["$ref"]
+                    elif "type" in real_type:
+                        node["type"] = real_type["type"]
+                        for k, v in real_type.items():
+                            if k != "type":
+                                node[k] = v
+                    continue
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
     return obj
 
 def custom_openapi():
+    # The route table is fixed after startup, so build the schema once and reuse it.
+    if app.openapi_schema:
+        return app.openapi_schema
     data = get_openapi(
         title=app.title,
         version=app.version,
@@ -134,12 +194,13 @@ def custom_openapi():
         routes=app.routes,
     )
     _flatten_any_of_nullable(data)
-    if (("components" in data) and ("schemas" in data["components"])
-            and ("ValidationError" in data["components"]["schemas"])
-            and ("properties" in data["components"]["schemas"]["ValidationError"])
-                and ("loc" in data["components"]["schemas"]["ValidationError"]["properties"])
-                and ("items" in data["components"]["schemas"]["ValidationError"]["properties"]["loc"])):
-        data["components"]["schemas"]["ValidationError"]["properties"]["loc"]["items"] = {"type": "string"}
+    try:
+        loc = data["components"]["schemas"]["ValidationError"]["properties"]["loc"]
+        if "items" in loc:
+            loc["items"] = {"type": "string"}
+    except (KeyError, TypeError):
+        pass
+    app.openapi_schema = data
     return data
 
 app.openapi = custom_openapi
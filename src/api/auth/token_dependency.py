@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials
 
 from src.api.auth.bearer import security
@@ -10,7 +10,7 @@ def get_current_token(credentials: HTTPAuthorizationCredentials = Depends(securi
 
     The token is the caller's upstream Schulnetz mobile token, replayed downstream
     (SchulwareAPI is a stateless proxy and issues no tokens of its own).
+    `security` has auto_error on, so a missing/malformed header is rejected before
+    this runs and `credentials` is always set.
     """
-    if credentials:
-        return credentials.credentials
-    raise HTTPException(status_code=403, detail="Invalid or missing token")
+    return credentials.credentials
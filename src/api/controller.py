@@ -131,9 +131,11 @@ def _register_endpoints(router: APIRouter, cls: type[Any], *urls: str) -> None:
         route for route in router.routes
         if isinstance(route, (Route, WebSocketRoute)) and route.endpoint in functions_set
     ]
+    # Drop them from the router in one pass rather than a list.remove() scan per route.
+    controller_route_ids = {id(route) for route in controller_routes}
+    router.routes[:] = [route for route in router.routes if id(route) not in controller_route_ids]
     prefix_length = len(router.prefix)
     for route in controller_routes:
-        router.routes.remove(route)
         route.path = route.path[prefix_length:]
         _update_route_endpoint_signature(cls, route)
         route.name = cls.__name__ + "." + route.name
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 from mediatorx import Mediator
 
 from src.api.controller import controller
 from src.api.dependencies import get_mediator, get_schulnetz_base_url
-from src.api.rate_limit import shared_limiter
+from src.api.rate_limit import per_worker, shared_limiter
 from src.application.dtos.web_session_dtos import (
     WebDownloadRequestDto,
     WebScrapeRequestDto,
@@ -18,12 +19,22 @@ logger = get_logger("web_session_controller")
 
 router = APIRouter(prefix="/api/websession", tags=["Web Session"])
 
+class _UpstreamStreamingResponse(StreamingResponse):
+    """Streams an `UpstreamBody` and always releases it, even when the client is
+    gone before the first chunk (e.g. sending the response start fails)."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
 @controller(router)
 class WebSessionController:
     mediator: Mediator = Depends(get_mediator)
 
     @router.post("/scrape", response_model=WebScrapeResponseDto)
-    @shared_limiter.limit("30/minute")
+    @shared_limiter.limit(per_worker("30/minute"))
     async def scrape(
         self,
         request: Request,
@@ -38,7 +49,7 @@ class WebSessionController:
         return await self.mediator.send(ScrapeWebPageQuery(body, base_url=base_url))
 
     @router.post("/download")
-    @shared_limiter.limit("30/minute")
+    @shared_limiter.limit(per_worker("30/minute"))
     async def download(
         self,
         request: Request,
@@ -49,21 +60,21 @@ class WebSessionController:
 
         Pass the relative `download_url` from a documents scrape plus the
         PHPSESSID (`session_id`) and the UA the session was created with.
-        Returns the file inline (502 if the session expired).
+        Returns the file inline, streamed through as it arrives (502 if the session expired).
         """
         result = await download_file(
             base_url, {"PHPSESSID": body.session_id}, body.download_url, user_agent=body.user_agent)
         if result is None:
             return Response(status_code=502, content="Download failed or session expired")
-        content, content_type, filename = result
-        return Response(
-            content=content,
+        chunks, content_type, filename = result
+        return _UpstreamStreamingResponse(
+            chunks,
             media_type=content_type,
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
 
     @router.post("/validate")
-    @shared_limiter.limit("10/minute")
+    @shared_limiter.limit(per_worker("10/minute"))
     async def validate(
         self,
         request: Request,
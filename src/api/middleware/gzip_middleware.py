@@ -0,0 +1,23 @@
+from collections.abc import Collection
+
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that passes the given paths through uncompressed.
+
+    Meant for routes that stream upstream files (PDFs, images, archives): they
+    are already compressed or don't shrink, and gzipping them costs CPU per chunk
+    and drops the upstream Content-Length.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: Collection[str] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
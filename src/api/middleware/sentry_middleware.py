@@ -18,7 +18,7 @@ class SentryMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Start timing the request
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Set request context
         set_tag("request.method", request.method)
@@ -41,15 +41,9 @@ class SentryMiddleware(BaseHTTPMiddleware):
             }
         )
 
-        # Extract user information from headers or JWT if available
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            try:
-                # You might want to decode JWT here to get user info
-                # For now, we'll just tag that it's an authenticated request
-                set_tag("auth.type", "bearer")
-            except Exception:
-                pass
+        # Tag authenticated requests (the bearer token itself is never recorded)
+        if request.headers.get("Authorization", "").startswith("Bearer "):
+            set_tag("auth.type", "bearer")
 
         # Set request context for Sentry
         set_context("request", {
@@ -66,7 +60,7 @@ class SentryMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
 
             # Calculate request duration
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             # Add performance breadcrumb
             add_breadcrumb(
@@ -99,7 +93,7 @@ class SentryMiddleware(BaseHTTPMiddleware):
 
         except HTTPException as exc:
             # Handle HTTP exceptions
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             add_breadcrumb(
                 message=f"HTTP exception: {exc.status_code}",
@@ -127,7 +121,7 @@ class SentryMiddleware(BaseHTTPMiddleware):
 
         except RequestValidationError as exc:
             # Handle validation errors
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             add_breadcrumb(
                 message="Request validation error",
@@ -154,7 +148,7 @@ class SentryMiddleware(BaseHTTPMiddleware):
 
         except Exception as exc:
             # Handle unexpected errors
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             add_breadcrumb(
                 message=f"Unexpected error: {type(exc).__name__}",
@@ -1,11 +1,15 @@
 """Shared rate-limit infrastructure.
 
-Provides the process-wide `shared_limiter` instance plus a reverse-proxy-aware
-client IP resolver and the standard 429 response handler.
+Provides the process-wide `shared_limiter` instance, `per_worker` for splitting
+in-memory limits between Gunicorn workers, a reverse-proxy-aware client IP
+resolver and the standard 429 response handler.
 """
 
+import os
+from collections.abc import Callable
+
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
@@ -14,7 +18,7 @@ def get_client_ip(request: Request) -> str:
     """Resolve the real client IP, honoring X-Forwarded-For / X-Real-IP."""
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
-        client_ip = forwarded_for.split(",")[0].strip()
+        client_ip = forwarded_for.partition(",")[0].strip()
         if client_ip:
             return client_ip
 
@@ -24,7 +28,32 @@ def get_client_ip(request: Request) -> str:
 
     return get_remote_address(request)
 
-shared_limiter = Limiter(key_func=get_client_ip)
+# Counters live in process memory unless RATE_LIMIT_STORAGE_URI points at a
+# shared backend (e.g. redis://…, needs its client library installed). Fixed
+# windows: an O(1) counter bump per hit, no per-request timestamp scan as with
+# moving-window.
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+shared_limiter = Limiter(key_func=get_client_ip, storage_uri=RATE_LIMIT_STORAGE_URI, strategy="fixed-window")
+
+# Number of processes splitting each in-memory limit. Only gunicorn.conf.py sets
+# it (from the worker count Gunicorn actually runs); the dev server and shared
+# storage keep the full limits.
+_worker_shares = 1
+
+def set_worker_shares(workers: int) -> None:
+    """Split in-memory limits between `workers` processes. Called from Gunicorn's `post_fork`."""
+    global _worker_shares
+    if RATE_LIMIT_STORAGE_URI.startswith("memory://"):
+        _worker_shares = max(1, workers)
+
+def per_worker(limit: str) -> Callable[[], str]:
+    """Scale an "N/period" limit to this worker's share of N, rounded up.
+
+    Returned as a callable so slowapi resolves it per request, after the worker
+    has been forked and told its share.
+    """
+    count, _, period = limit.partition("/")
+    return lambda: f"{-(-int(count) // _worker_shares)}/{period}"
 
 def shared_rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+    return ORJSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
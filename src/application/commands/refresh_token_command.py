@@ -13,7 +13,11 @@ back to credentials (when provided), or raises `NeedsCredentials`.
 """
 
 import asyncio
-from dataclasses import dataclass
+import functools
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 
 from entrance import LoginFailed, MfaRequired, NeedsCredentials
 from entrance import login as ms_login
@@ -26,6 +30,16 @@ from src.infrastructure.logging_config import get_logger
 
 logger = get_logger("login_command")
 
+# ms-entrance logins are blocking and each holds a worker thread for several
+# Microsoft round-trips. They get their own small, long-lived pool so a burst
+# of logins queues there instead of draining the default thread pool that the
+# rest of the app (e.g. scrape parsing) relies on.
+MAX_PARALLEL_LOGINS = 4
+_login_pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_LOGINS, thread_name_prefix="ms-entrance")
+
+# In-flight logins by request digest; entries drop out as soon as the run finishes.
+_inflight_logins: dict[bytes, asyncio.Future[LoginResponseDto]] = {}
+
 
 @dataclass
 class LoginCommand(ICommand[LoginResponseDto]):
@@ -38,12 +52,34 @@ class LoginCommand(ICommand[LoginResponseDto]):
     user_agent: str | None = None
 
 
+def _login_key(command: LoginCommand) -> bytes:
+    """Digest of every login input (credentials and cookie jar included), so no secrets are held as keys."""
+    # stdlib json, not orjson: the cookie jar is arbitrary caller JSON, and orjson
+    # rejects some valid JSON (integers beyond 64 bits) that json serializes fine.
+    payload = json.dumps(asdict(command), sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
 class LoginHandler(ICommandHandler[LoginCommand, LoginResponseDto]):
     """Mint fresh mobile + web tokens by replaying the cookie jar (or credentials)
     through Microsoft Entra headlessly via ms-entrance, then exchanging the
     resulting authorization codes at Schulnetz over plain HTTP."""
 
     async def handle(self, command: LoginCommand) -> LoginResponseDto:
+        # Identical concurrent logins (client retries, double submits) share one
+        # run: each would otherwise rotate the same cookie jar and race Microsoft.
+        key = _login_key(command)
+        task = _inflight_logins.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._login_once(command))
+            _inflight_logins[key] = task
+            task.add_done_callback(lambda _: _inflight_logins.pop(key, None))
+        else:
+            logger.info("Login: joining an identical in-flight login")
+        # Shielded so one caller disconnecting doesn't cancel the run for the others.
+        return await asyncio.shield(task)
+
+    async def _login_once(self, command: LoginCommand) -> LoginResponseDto:
         base = command.schulnetz_base_url.rstrip("/")
         cookies = command.session_cookies or None
         if cookies:
@@ -63,21 +99,21 @@ class LoginHandler(ICommandHandler[LoginCommand, LoginResponseDto]):
             callback_url = web_res.get("redirect_url")
             if not callback_url:
                 return LoginResponseDto(success=False, message="No web callback URL from login")
-            web_cookies, web_info = await capture_web_session(
-                base, callback_url, seed_cookies=anon_cookies
+
+            # 2) Mobile token round-trip → access/refresh tokens. It only needs the
+            # Microsoft cookies from step 1, not the school session, so the mobile
+            # Entra login and token exchange run while the web callback is
+            # delivered to Schulnetz.
+            (web_cookies, web_info), (mob_res, access_token, refresh_token) = await asyncio.gather(
+                capture_web_session(base, callback_url, seed_cookies=anon_cookies),
+                self._mobile_tokens(base, command, cookies),
             )
             if not web_cookies or "PHPSESSID" not in web_cookies:
                 return LoginResponseDto(success=False, message="No web session captured after login")
             session_id = web_cookies["PHPSESSID"]
             web_info = web_info or {}
 
-            # 2) Mobile token round-trip → access/refresh tokens.
-            mob = generate_oauth_url(base, auth_type="mobile")
-            mob_res = await self._login(mob["auth_url"], command, cookies)
             cookies = mob_res.get("session_cookies") or cookies
-            access_token, refresh_token = await exchange_code_for_tokens(
-                mob_res["code"], mob["code_verifier"], base
-            )
 
             logger.info("login: php=%s id=%s transid=%s token=%s",
                         bool(session_id), web_info.get("id"), web_info.get("transid"), bool(access_token))
@@ -109,13 +145,21 @@ class LoginHandler(ICommandHandler[LoginCommand, LoginResponseDto]):
             logger.exception("Login failed")
             return LoginResponseDto(success=False, message=f"Login failed: {ex}")
 
+    async def _mobile_tokens(self, base: str, command: LoginCommand, cookies):
+        """Mobile authorize round-trip, then the code → token exchange at `/token.php`.
+        Returns the ms-entrance result (for its rotated cookies) plus both tokens."""
+        mob = generate_oauth_url(base, auth_type="mobile")
+        mob_res = await self._login(mob["auth_url"], command, cookies)
+        access_token, refresh_token = await exchange_code_for_tokens(mob_res["code"], mob["code_verifier"], base)
+        return mob_res, access_token, refresh_token
+
     async def _login(self, authorize_url: str, command: LoginCommand, cookies, ms_redirect: bool = False):
         """Run the synchronous ms-entrance login off the event loop. Seeds the
         stored cookie jar for a silent SSO; falls back to credentials if given.
         `cookies` is always an inline list or None — never a file on disk.
         With ms_redirect=True the raw Microsoft → provider callback URL is returned
         (incl. session_state) without consuming the code."""
-        return await asyncio.to_thread(
+        login = functools.partial(
             ms_login,
             authorize_url,
             username=command.email,
@@ -125,3 +169,4 @@ class LoginHandler(ICommandHandler[LoginCommand, LoginResponseDto]):
             cookies=cookies,
             ms_redirect=ms_redirect,
         )
+        return await asyncio.get_running_loop().run_in_executor(_login_pool, login)
@@ -11,9 +11,13 @@ class GetAppInfoQuery(IQuery[AppInfoDto]):
     pass
 
 
+# Both values come from application.properties, which is only read at startup.
+_APP_INFO = AppInfoDto(
+    version=app_config.get_version(),
+    environment=app_config.get_environment(),
+)
+
+
 class GetAppInfoHandler(IQueryHandler[GetAppInfoQuery, AppInfoDto]):
     async def handle(self, query: GetAppInfoQuery) -> AppInfoDto:
-        return AppInfoDto(
-            version=app_config.get_version(),
-            environment=app_config.get_environment(),
-        )
+        return _APP_INFO
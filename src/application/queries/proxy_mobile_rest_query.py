@@ -1,13 +1,13 @@
-import json
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 from fastapi import HTTPException, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from mediatorx import IQuery, IQueryHandler
 
 from src.application.services.test_token_config import get_mock_data, is_test_token
+from src.infrastructure.http_client import pooled_client
 from src.infrastructure.logging_config import get_logger
 from src.infrastructure.monitoring import add_breadcrumb, capture_exception, monitor_performance
 
@@ -28,6 +28,17 @@ _ENDPOINT_MAP = {
 }
 
 
+# Identical for every proxied call; only the bearer token is added per request.
+_BASE_HEADERS = {
+    "Referer": "https://schulnetz.web.app/",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 OPR/120.0.0.0",
+    "Accept": "application/json",
+}
+
+# Upstream error pages can be full HTML documents; only the head is useful in the detail.
+_ERROR_BODY_CAP = 1000
+
+
 @dataclass
 class ProxyMobileRestQuery(IQuery[Any]):
     token: str
@@ -47,7 +58,7 @@ class ProxyMobileRestHandler(IQueryHandler[ProxyMobileRestQuery, Any]):
 
         # Test-token shortcut: return mock data.
         if is_test_token(token):
-            logger.info(f"Test token detected - returning mock data for: {target_url_path}")
+            logger.info("Test token detected - returning mock data for: %s", target_url_path)
             normalized_path = f"/rest/v1/{target_url_path.lstrip('/')}"
             data_type = _ENDPOINT_MAP.get(normalized_path)
 
@@ -55,11 +66,11 @@ class ProxyMobileRestHandler(IQueryHandler[ProxyMobileRestQuery, Any]):
                 if "/me/cockpitReport/" in normalized_path:
                     parts = normalized_path.split("/")
                     report_id = int(parts[-1]) if parts[-1].isdigit() else 1
-                    return JSONResponse(content=get_mock_data("cockpitreport", report_id=report_id), status_code=200)
+                    return ORJSONResponse(content=get_mock_data("cockpitreport", report_id=report_id), status_code=200)
                 # Default to events for unknown endpoints
                 data_type = "events"
 
-            return JSONResponse(content=get_mock_data(data_type), status_code=200)
+            return ORJSONResponse(content=get_mock_data(data_type), status_code=200)
 
         target_url_path = f"/rest/v1/{target_url_path.lstrip('/')}"
         target_url = f"{query.base_url.rstrip('/')}{target_url_path}"
@@ -71,17 +82,12 @@ class ProxyMobileRestHandler(IQueryHandler[ProxyMobileRestQuery, Any]):
             data={"method": method, "path": target_url_path},
         )
 
-        request_headers = {
-            "Referer": "https://schulnetz.web.app/",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36 OPR/120.0.0.0",
-            "Accept": "application/json",
-            "Authorization": f"Bearer {token}",
-        }
+        request_headers = {**_BASE_HEADERS, "Authorization": f"Bearer {token}"}
 
         params_to_forward = {name: value for name, value in (query_params or []) if value is not None}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with pooled_client() as client:
                 response = await client.request(
                     method,
                     target_url,
@@ -90,17 +96,12 @@ class ProxyMobileRestHandler(IQueryHandler[ProxyMobileRestQuery, Any]):
                     content=None,
                 )
             response.raise_for_status()
-            content_type = response.headers.get("content-type", "")
-            if "application/json" in content_type:
-                return JSONResponse(
-                    content=response.json(),
-                    status_code=response.status_code,
-                    headers={"Content-Type": content_type},
-                )
+            # Upstream bytes go out unchanged, JSON included: re-encoding would
+            # cost a parse per call and turn integers beyond 64 bits into floats.
             return Response(
                 content=response.content,
                 status_code=response.status_code,
-                headers={"Content-Type": content_type},
+                headers={"Content-Type": response.headers.get("content-type", "")},
             )
         except httpx.HTTPStatusError as e:
             capture_exception(
@@ -115,7 +116,7 @@ class ProxyMobileRestHandler(IQueryHandler[ProxyMobileRestQuery, Any]):
             )
             raise HTTPException(
                 status_code=e.response.status_code,
-                detail=f"Mobile API error ({e.response.status_code}): {e.response.text}",
+                detail=f"Mobile API error ({e.response.status_code}): {e.response.content[:_ERROR_BODY_CAP].decode('utf-8', 'replace')}",
             )
         except httpx.RequestError as e:
             capture_exception(
@@ -132,21 +133,6 @@ class ProxyMobileRestHandler(IQueryHandler[ProxyMobileRestQuery, Any]):
                 status_code=500,
                 detail=f"Network error or mobile API service unavailable: {e}",
             )
-        except json.JSONDecodeError as e:
-            capture_exception(
-                e,
-                context={
-                    "api_type": "mobile_proxy",
-                    "method": method,
-                    "path": target_url_path,
-                    "error_type": "json_decode_error",
-                },
-                level="error",
-            )
-            raise HTTPException(
-                status_code=500,
-                detail="Mobile API returned malformed or non-JSON response.",
-            )
         except Exception as e:
             capture_exception(
                 e,
@@ -1,4 +1,4 @@
-import re
+import asyncio
 from dataclasses import dataclass
 
 from mediatorx import IQuery, IQueryHandler
@@ -13,7 +13,7 @@ from src.application.dtos.web.scrape_dtos import GradesPageDto
 from src.application.services.schulnetz_web_scrapers.noten_scraper import parse_semester_options, scrape_noten
 from src.application.services.schulnetz_web_scrapers.schedule_scraper import parse_scheduler_xml
 from src.application.services.schulnetz_web_scrapers.unterricht_scraper import scrape_unterricht
-from src.application.services.web_session_service import fetch_scheduler_data, save_semid, scrape_page
+from src.application.services.web_session_service import TRANSID_RE, fetch_scheduler_data, save_semid, scrape_page
 from src.infrastructure.logging_config import get_logger
 
 logger = get_logger("scrape_web_page_query")
@@ -22,7 +22,6 @@ logger = get_logger("scrape_web_page_query")
 # the dropdown lists every term the school ever had, but a student only has data
 # in a handful of recent ones.
 _MAX_EMPTY_SEMESTERS = 2
-_TRANSID_RE = re.compile(r"transid=([a-f0-9]{4,})")
 
 
 async def _scrape_all_semester_grades(
@@ -40,18 +39,20 @@ async def _scrape_all_semester_grades(
         logger.warning("grades: initial Noten page load returned None (web session expired / redirect)")
         return None
 
-    options = parse_semester_options(html)
-    student = scrape_noten(html).student
+    # BeautifulSoup parses are CPU-bound; run them in a worker thread so a large
+    # grades page doesn't stall every other request on the event loop.
+    options = await asyncio.to_thread(parse_semester_options, html)
+    page0 = await asyncio.to_thread(scrape_noten, html)
+    student = page0.student
     logger.info("grades: %d semester options: %s", len(options),
                 [f"{lbl}{'*' if sel else ''}" for _, lbl, sel in options])
     if not options:
         # No switcher — just the single visible semester.
-        page0 = scrape_noten(html)
         logger.info("grades: no semester switcher; %d courses on the visible page", len(page0.courses))
         return page0
 
     original = next((sid for sid, _, sel in options if sel), options[0][0])
-    fresh = (m.group(1) if (m := _TRANSID_RE.search(html)) else None) or transid
+    fresh = (m.group(1) if (m := TRANSID_RE.search(html)) else None) or transid
 
     # The dropdown is newest-first: a few (always-empty) *future* placeholder
     # terms, then the current term, then history. We must NOT start at the
@@ -69,9 +70,9 @@ async def _scrape_all_semester_grades(
         page_html = await scrape_page(base_url, cookies, "21311", session_id, transid, user_agent=user_agent)
         if page_html is None:
             break
-        if m := _TRANSID_RE.search(page_html):
+        if m := TRANSID_RE.search(page_html):
             fresh = m.group(1)
-        page = scrape_noten(page_html)
+        page = await asyncio.to_thread(scrape_noten, page_html)
         logger.info("grades: sem %s (%s) -> %d courses", label, sem_id, len(page.courses))
         if page.courses:
             merged.extend(page.courses)
@@ -126,7 +127,7 @@ class ScrapeWebPageHandler(IQueryHandler[ScrapeWebPageQuery, WebScrapeResponseDt
             if xml is None:
                 return WebScrapeResponseDto(success=False, message="Session expired or schedule not accessible.")
             try:
-                return WebScrapeResponseDto(success=True, schedule=parse_scheduler_xml(xml))
+                return WebScrapeResponseDto(success=True, schedule=await asyncio.to_thread(parse_scheduler_xml, xml))
             except Exception as e:
                 logger.error(f"Schedule parser error: {e}")
                 return WebScrapeResponseDto(success=False, message=f"Parsing error: {str(e)}")
@@ -148,7 +149,8 @@ class ScrapeWebPageHandler(IQueryHandler[ScrapeWebPageQuery, WebScrapeResponseDt
 
         try:
             # Each scraper returns its page's typed model; place it in the matching field.
-            return WebScrapeResponseDto(success=True, **{body.page: parser(html)})
+            # Parsing is CPU-bound, so it runs off the event loop.
+            return WebScrapeResponseDto(success=True, **{body.page: await asyncio.to_thread(parser, html)})
         except Exception as e:
             logger.error(f"Scraper error for {body.page}: {e}")
             return WebScrapeResponseDto(success=False, message=f"Parsing error: {str(e)}")
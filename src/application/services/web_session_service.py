@@ -1,11 +1,21 @@
+import datetime
 import httpx
 import re
+from collections.abc import AsyncIterator
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from src.infrastructure.http_client import pooled_client
 from src.infrastructure.logging_config import get_logger
 
 logger = get_logger("web_session")
 
+# Matches both session params in one scan; group 1 is the name, group 2 the value.
+_SESSION_PARAM_RE = re.compile(r'[?&](id|transid)=([a-f0-9]+)')
+# A page's (possibly rotated) transid; also used by the scrape query.
+TRANSID_RE = re.compile(r"transid=([a-f0-9]{4,})")
+_DISPOSITION_FILENAME_RE = re.compile(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?')
+_ANCHORS_ONLY = SoupStrainer("a")
+
 WEB_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/147.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
@@ -15,22 +25,43 @@ WEB_HEADERS = {
     "Sec-Fetch-Mode": "navigate",
 }
 
+_SAME_ORIGIN_HEADERS = {**WEB_HEADERS, "Sec-Fetch-Site": "same-origin"}
+
+# Microsoft Entra login host: where the OAuth flow starts and where an expired
+# web session gets bounced to.
+_MS_LOGIN_HOST = "login.microsoftonline.com"
+
 async def discover_web_oauth(schulnetz_base_url: str) -> tuple[str, dict[str, str]]:
     """Start the OAuth flow from the school root, like a browser.
 
-    GET `/` (unauthenticated), follow the redirect chain to the Microsoft
-    authorize URL, and return it together with the anonymous PHPSESSID the school
-    set. The root flow uses redirect_uri=`/` (no PKCE), so the eventual callback
-    lands on `/` and renders the full dashboard (with id/transid) — unlike
-    authorize.php, whose callback returns to itself on a bare page.
+    GET `/` (unauthenticated), follow the school's redirect chain up to the
+    Microsoft authorize URL, and return it together with the anonymous PHPSESSID
+    the school set. The root flow uses redirect_uri=`/` (no PKCE), so the eventual
+    callback lands on `/` and renders the full dashboard (with id/transid) —
+    unlike authorize.php, whose callback returns to itself on a bare page.
+
+    Every hop up to Microsoft is fetched (schools may bounce through an SSO
+    or CDN host first); the Microsoft authorize page itself is left to
+    ms-entrance, which loads it on its own.
     """
-    async with httpx.AsyncClient(headers=WEB_HEADERS, follow_redirects=True, timeout=30.0) as client:
-        r = await client.get(f"{schulnetz_base_url}/")
+    async with pooled_client(headers=WEB_HEADERS, timeout=30.0) as client:
+        url = f"{schulnetz_base_url}/"
         anon: dict[str, str] = {}
-        for resp in r.history + [r]:
-            anon.update(dict(resp.cookies))
-        logger.info(f"Discovered web authorize URL via root; anon cookies: {list(anon.keys())}")
-        return str(r.url), anon
+        for _ in range(20):  # httpx's own redirect cap
+            r = await client.get(url)
+            anon.update(dict(r.cookies))
+            if not r.has_redirect_location:
+                break
+            url = str(r.next_request.url)
+            if r.next_request.url.host == _MS_LOGIN_HOST:
+                break
+        logger.info("Discovered web authorize URL via root; anon cookies: %s", list(anon))
+        return url, anon
+
+
+def _collect_cookies(response: httpx.Response) -> dict[str, str]:
+    """Cookies set anywhere along a redirect chain, later hops winning, in one pass."""
+    return {name: value for r in (*response.history, response) for name, value in r.cookies.items()}
 
 
 async def capture_web_session(
@@ -54,18 +85,12 @@ async def capture_web_session(
         Tuple of (cookies_dict, session_info) or (None, None) if failed.
         session_info contains: id, transid, navigation_urls from the dashboard.
     """
-    def _collect(resp) -> dict[str, str]:
-        c: dict[str, str] = {}
-        for r in resp.history + [resp]:
-            c.update(dict(r.cookies))
-        return c
-
     logger.info("Delivering web OAuth callback to Schulnetz")
 
-    async with httpx.AsyncClient(headers=WEB_HEADERS, follow_redirects=True, timeout=30.0, cookies=seed_cookies or {}) as client:
+    async with pooled_client(headers=WEB_HEADERS, follow_redirects=True, timeout=30.0, cookies=seed_cookies or {}) as client:
         try:
             response = await client.get(callback_url)
-            cookies = _collect(response)
+            cookies = _collect_cookies(response)
             session_info = _extract_session_info(str(response.url), response.text)
 
             # PKCE-enforced instances may need the verifier on the callback to
@@ -78,44 +103,49 @@ async def capture_web_session(
             if code_verifier and not full:
                 sep = "&" if "?" in callback_url else "?"
                 response = await client.get(f"{callback_url}{sep}code_verifier={code_verifier}")
-                cookies = _collect(response) or cookies
+                cookies = _collect_cookies(response) or cookies
                 follow = _extract_session_info(str(response.url), response.text)
                 if follow:
                     session_info = {**(session_info or {}), **follow}
 
-            logger.info(f"Final status: {response.status_code}, URL: {response.url}")
-            logger.info(f"Cookies captured: {list(cookies.keys())}")
+            logger.info("Final status: %s, URL: %s", response.status_code, response.url)
+            logger.info("Cookies captured: %s", list(cookies))
 
             if "PHPSESSID" not in cookies:
                 logger.warning("No PHPSESSID captured — login may have failed")
                 return None, None
 
-            logger.info(f"Session captured. PHPSESSID: {cookies['PHPSESSID'][:20]}...")
+            logger.info("Session captured. PHPSESSID: %.20s...", cookies["PHPSESSID"])
             if session_info:
-                logger.info(f"Session id: {session_info.get('id')}, transid: {session_info.get('transid')}, pages: {len(session_info.get('navigation_urls', {}))}")
+                logger.info("Session id: %s, transid: %s, pages: %d", session_info.get("id"),
+                            session_info.get("transid"), len(session_info.get("navigation_urls", {})))
 
             return cookies, session_info
 
         except Exception as e:
-            logger.error(f"Failed to capture web session: {e}")
+            logger.error("Failed to capture web session: %s", e)
             return None, None
 
+
+def _find_session_params(text: str, info: dict) -> None:
+    """Fill missing id/transid in `info` from the first occurrences in `text`, in one pass."""
+    for m in _SESSION_PARAM_RE.finditer(text):
+        info.setdefault(m.group(1), m.group(2))
+        if "id" in info and "transid" in info:
+            return
+
 def _extract_session_info(url: str, html: str) -> dict[str, str] | None:
     """Extract session-specific parameters (id, transid) and navigation URLs from the landing page."""
     info = {}
-
-    id_match = re.search(r'[?&]id=([a-f0-9]+)', url)
-    if id_match:
-        info["id"] = id_match.group(1)
-
-    transid_match = re.search(r'[?&]transid=([a-f0-9]+)', url)
-    if transid_match:
-        info["transid"] = transid_match.group(1)
+    _find_session_params(url, info)
 
     if not html:
         return info if info else None
 
-    soup = BeautifulSoup(html, "html.parser")
+    # lxml (C) instead of the pure-Python html.parser: this runs on every login over
+    # the full dashboard, and only plain anchors are read from it — so only <a>
+    # elements are built into the tree at all.
+    soup = BeautifulSoup(html, "lxml", parse_only=_ANCHORS_ONLY)
 
     navigation_urls = {}
     for link in soup.select("a[href*='pageid']"):
@@ -129,17 +159,23 @@ def _extract_session_info(url: str, html: str) -> dict[str, str] | None:
 
     # Dashboard links (index.php?pageid=..&id=..&transid=..) carry id/transid even
     # when the landing URL doesn't — fall back to the page body for both.
-    if not info.get("id"):
-        m = re.search(r'[?&]id=([a-f0-9]+)', html)
-        if m:
-            info["id"] = m.group(1)
-    if not info.get("transid"):
-        m = re.search(r'[?&]transid=([a-f0-9]+)', html)
-        if m:
-            info["transid"] = m.group(1)
+    if "id" not in info or "transid" not in info:
+        _find_session_params(html, info)
 
     return info if info else None
 
+def _session_headers(schulnetz_base_url: str, user_agent: str | None, extra: dict[str, str] | None = None) -> dict[str, str]:
+    """Same-origin request headers for replaying a stored web session."""
+    headers = {**_SAME_ORIGIN_HEADERS, "Referer": f"{schulnetz_base_url}/"}
+    if extra:
+        headers.update(extra)
+    # Schulnetz binds the PHPSESSID to the UA that created it. The refresh runner
+    # mints the session in a browser using the account UA, so the scrape must
+    # replay that same UA — otherwise the session is rejected.
+    if user_agent:
+        headers["User-Agent"] = user_agent
+    return headers
+
 async def scrape_page(schulnetz_base_url: str, cookies: dict[str, str], pageid: str, session_id: str, transid: str, user_agent: str | None = None) -> str | None:
     """
     Fetch a Schulnetz page using stored session cookies.
@@ -160,49 +196,69 @@ async def scrape_page(schulnetz_base_url: str, cookies: dict[str, str], pageid:
     url = f"{schulnetz_base_url}/index.php"
     params = {"pageid": pageid, "id": session_id, "transid": transid}
 
-    headers = {
-        **WEB_HEADERS,
-        "Referer": f"{schulnetz_base_url}/",
-        "Sec-Fetch-Site": "same-origin",
-    }
-    # Schulnetz binds the PHPSESSID to the UA that created it. The refresh runner
-    # mints the session in a browser using the account UA, so the scrape must
-    # replay that same UA — otherwise the session is rejected.
-    if user_agent:
-        headers["User-Agent"] = user_agent
+    headers = _session_headers(schulnetz_base_url, user_agent)
 
-    async with httpx.AsyncClient(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
+    async with pooled_client(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
         try:
             response = await client.get(url, params=params)
 
             if response.status_code == 200:
-                if "login.microsoftonline.com" in str(response.url):
+                if response.url.host == _MS_LOGIN_HOST:
                     logger.warning("Session expired — redirected to Microsoft login")
                     return None
                 return response.text
 
-            logger.warning(f"Unexpected status {response.status_code} for pageid={pageid}")
+            logger.warning("Unexpected status %s for pageid=%s", response.status_code, pageid)
             return None
 
         except Exception as e:
-            logger.error(f"Failed to scrape pageid={pageid}: {e}")
+            logger.error("Failed to scrape pageid=%s: %s", pageid, e)
             return None
 
 def _filename_from_disposition(disposition: str | None, fallback: str) -> str:
     """Pull the filename out of a Content-Disposition header, else use fallback."""
     if not disposition:
         return fallback
-    m = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', disposition)
+    m = _DISPOSITION_FILENAME_RE.search(disposition)
     return m.group(1).strip() if m else fallback
 
 
+class UpstreamBody:
+    """A streamed upstream response body that owns the response and its client.
+
+    Iterating yields the body and releases both once it is exhausted or
+    abandoned. `aclose()` releases them whether or not iteration ever started:
+    a generator's `finally` never runs if the generator was never entered, which
+    would leave the connection checked out of the shared pool.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, response: httpx.Response) -> None:
+        self._client = client
+        self._response = response
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._response.aiter_bytes():
+                yield chunk
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Release the upstream response and client; safe to call more than once."""
+        await self._response.aclose()
+        await self._client.aclose()
+
+
 async def download_file(
     schulnetz_base_url: str,
     cookies: dict[str, str],
     download_url: str,
     user_agent: str | None = None,
-) -> tuple[bytes, str, str] | None:
-    """Fetch a filestore document's raw bytes using the stored web session.
+) -> tuple[UpstreamBody, str, str] | None:
+    """Open a filestore document using the stored web session.
 
     Args:
         schulnetz_base_url: e.g. https://schulnetz.bbbaden.ch
@@ -212,47 +268,65 @@ async def download_file(
         user_agent: UA the PHPSESSID was created with (Schulnetz binds to it).
 
     Returns:
-        (content, content_type, filename) or None if the session expired / failed.
+        (chunks, content_type, filename) or None if the session expired / failed.
+        `chunks` streams the body straight from Schulnetz and releases the upstream
+        connection once it is exhausted — the file is never buffered whole. The
+        caller must `await chunks.aclose()` if it may not consume it fully.
     """
     url = f"{schulnetz_base_url}/{download_url.lstrip('/')}"
-    headers = {
-        **WEB_HEADERS,
-        "Referer": f"{schulnetz_base_url}/",
-        "Sec-Fetch-Site": "same-origin",
-    }
-    # Schulnetz binds the PHPSESSID to the UA that created it. The refresh runner
-    # mints the session in a browser using the account UA, so the scrape must
-    # replay that same UA — otherwise the session is rejected.
-    if user_agent:
-        headers["User-Agent"] = user_agent
-
-    async with httpx.AsyncClient(headers=headers, cookies=cookies, follow_redirects=True, timeout=60.0) as client:
-        try:
-            response = await client.get(url)
-            if response.status_code != 200 or "login.microsoftonline.com" in str(response.url):
-                logger.warning(f"Download failed (status {response.status_code}) for {url}")
-                return None
-
-            content_type = response.headers.get("content-type", "application/octet-stream")
-            # An HTML body means we were bounced to a login/error page, not a file.
-            if content_type.startswith("text/html"):
-                logger.warning("Download returned HTML — session likely expired")
-                return None
-
-            filename = _filename_from_disposition(
-                response.headers.get("content-disposition"), "document")
-            return response.content, content_type, filename
-        except Exception as e:
-            logger.error(f"Failed to download file: {e}")
-            return None
+    headers = _session_headers(schulnetz_base_url, user_agent)
+
+    client = pooled_client(headers=headers, cookies=cookies, follow_redirects=True, timeout=60.0)
+    try:
+        # Status and headers decide before any body is read: a bounce to a
+        # login/error page is rejected without downloading it.
+        response = await client.send(client.build_request("GET", url), stream=True)
+    except Exception as e:
+        await client.aclose()
+        logger.error("Failed to download file: %s", e)
+        return None
+
+    if response.status_code != 200 or response.url.host == _MS_LOGIN_HOST:
+        logger.warning("Download failed (status %s) for %s", response.status_code, url)
+    # An HTML body means we were bounced to a login/error page, not a file.
+    elif (content_type := response.headers.get("content-type", "application/octet-stream")).startswith("text/html"):
+        logger.warning("Download returned HTML — session likely expired")
+    else:
+        filename = _filename_from_disposition(
+            response.headers.get("content-disposition"), "document")
+        return UpstreamBody(client, response), content_type, filename
+
+    await response.aclose()
+    await client.aclose()
+    return None
 
 
 async def validate_session(schulnetz_base_url: str, cookies: dict[str, str], session_id: str, transid: str, user_agent: str | None = None) -> bool:
-    """Check if a PHP session is still valid."""
-    html = await scrape_page(schulnetz_base_url, cookies, "21111", session_id, transid, user_agent=user_agent)
-    if html is None:
-        return False
-    return "pageid" in html
+    """Check if a PHP session is still valid.
+
+    Streams the probe page instead of downloading it: a bounce to the Microsoft
+    login is rejected from the final URL without reading its body, and a live
+    session is confirmed at the first `pageid` link rather than the end of the page.
+    """
+    url = f"{schulnetz_base_url}/index.php"
+    params = {"pageid": "21111", "id": session_id, "transid": transid}
+    headers = _session_headers(schulnetz_base_url, user_agent)
+
+    async with pooled_client(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
+        try:
+            async with client.stream("GET", url, params=params) as response:
+                if response.status_code != 200 or response.url.host == _MS_LOGIN_HOST:
+                    return False
+                tail = b""
+                async for chunk in response.aiter_bytes():
+                    # Carry the last few bytes over so a match split across chunks is found.
+                    if b"pageid" in chunk or b"pageid" in tail + chunk[:5]:
+                        return True
+                    tail = (tail + chunk[:5])[-5:] if len(chunk) < 5 else chunk[-5:]
+                return False
+        except Exception as e:
+            logger.error("Failed to validate session: %s", e)
+            return False
 
 async def fetch_scheduler_data(schulnetz_base_url: str, cookies: dict[str, str], session_id: str, transid: str, date: str | None = None, user_agent: str | None = None) -> str | None:
     """Fetch timetable/agenda data from the scheduler AJAX endpoint.
@@ -263,20 +337,17 @@ async def fetch_scheduler_data(schulnetz_base_url: str, cookies: dict[str, str],
     the agenda page first, lift its transid, and pull a wide date window (the
     whole rest of the term) rather than a single week.
     """
-    from datetime import datetime, timedelta
-
-    if date is None:
-        date = datetime.now().strftime("%Y-%m-%d")
-
-    dt = datetime.strptime(date, "%Y-%m-%d")
-    min_date = (dt - timedelta(days=35)).strftime("%Y-%m-%d")
-    max_date = (dt + timedelta(days=120)).strftime("%Y-%m-%d")
+    # Work on a date object directly: no now() → strftime → strptime round-trip.
+    day = datetime.date.fromisoformat(date) if date else datetime.date.today()
+    date = day.isoformat()
+    min_date = (day - datetime.timedelta(days=35)).isoformat()
+    max_date = (day + datetime.timedelta(days=120)).isoformat()
 
     # Mint a fresh transid by loading the agenda page (pageid 22202).
     sched_transid = transid
     page_html = await scrape_page(schulnetz_base_url, cookies, "22202", session_id, transid, user_agent=user_agent)
     if page_html:
-        m = re.search(r"transid=([a-f0-9]{4,})", page_html)
+        m = TRANSID_RE.search(page_html)
         if m:
             sched_transid = m.group(1)
 
@@ -293,28 +364,20 @@ async def fetch_scheduler_data(schulnetz_base_url: str, cookies: dict[str, str],
         "timeshift": "-120",
     }
 
-    headers = {
-        **WEB_HEADERS,
-        "Referer": f"{schulnetz_base_url}/",
-        "Sec-Fetch-Site": "same-origin",
+    headers = _session_headers(schulnetz_base_url, user_agent, {
         "Accept": "text/html, */*; q=0.01",
         "X-Requested-With": "XMLHttpRequest",
-    }
-    # Schulnetz binds the PHPSESSID to the UA that created it. The refresh runner
-    # mints the session in a browser using the account UA, so the scrape must
-    # replay that same UA — otherwise the session is rejected.
-    if user_agent:
-        headers["User-Agent"] = user_agent
+    })
 
-    async with httpx.AsyncClient(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
+    async with pooled_client(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
         try:
             response = await client.get(url, params=params)
             if response.status_code == 200:
                 return response.text
-            logger.warning(f"Scheduler returned {response.status_code}")
+            logger.warning("Scheduler returned %s", response.status_code)
             return None
         except Exception as e:
-            logger.error(f"Failed to fetch scheduler data: {e}")
+            logger.error("Failed to fetch scheduler data: %s", e)
             return None
 
 async def save_semid(
@@ -350,25 +413,17 @@ async def save_semid(
         ("xajaxargs[]", return_url),
     ])
 
-    headers = {
-        **WEB_HEADERS,
-        "Referer": f"{schulnetz_base_url}/",
-        "Sec-Fetch-Site": "same-origin",
+    headers = _session_headers(schulnetz_base_url, user_agent, {
         "X-Requested-With": "XMLHttpRequest",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-    }
-    # Schulnetz binds the PHPSESSID to the UA that created it. The refresh runner
-    # mints the session in a browser using the account UA, so the scrape must
-    # replay that same UA — otherwise the session is rejected.
-    if user_agent:
-        headers["User-Agent"] = user_agent
+    })
 
-    async with httpx.AsyncClient(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
+    async with pooled_client(headers=headers, cookies=cookies, follow_redirects=True, timeout=30.0) as client:
         try:
             response = await client.post(url, params=params, content=body)
             return response.status_code == 200
         except Exception as e:
-            logger.error(f"Failed to save semester {sem_id}: {e}")
+            logger.error("Failed to save semester %s: %s", sem_id, e)
             return False
 
 
@@ -0,0 +1,15 @@
+"""Gunicorn worker class for production (referenced only from gunicorn.conf.py).
+
+Separate from `server.py` because importing `uvicorn_worker` pulls in Gunicorn,
+which doesn't import on Windows.
+"""
+
+from uvicorn_worker import UvicornWorker as _BaseUvicornWorker
+
+from src.infrastructure.server import SERVER_KWARGS
+
+
+class UvicornWorker(_BaseUvicornWorker):
+    """Gunicorn worker with the same `SERVER_KWARGS` as the dev server."""
+
+    CONFIG_KWARGS = {**_BaseUvicornWorker.CONFIG_KWARGS, **SERVER_KWARGS}
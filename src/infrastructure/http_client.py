@@ -0,0 +1,69 @@
+"""Process-wide HTTP connection pool for upstream Schulnetz calls.
+
+Callers still open a short-lived `httpx.AsyncClient` per operation — cookies and
+headers are per user and must never leak between requests on a shared client —
+but every client rides the same transport, so TCP/TLS connections (and HTTP/2
+streams) to each school host are kept alive and reused across requests instead
+of being rebuilt on every call.
+
+httpx ignores `HTTP(S)_PROXY`/`ALL_PROXY`/`NO_PROXY` once a client is given an
+explicit transport, so the environment's proxies are resolved here the same way
+httpx would and mounted as shared proxy transports on every pooled client.
+"""
+
+import httpx
+from httpx._utils import get_environment_proxies  # the helper httpx's own env-proxy handling uses (httpx pinned)
+
+_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=30.0)
+
+
+class _SharedTransport(httpx.AsyncHTTPTransport):
+    """Transport that outlives the clients using it.
+
+    `AsyncClient.__aexit__`/`aclose()` close their transport; here those are
+    no-ops so one client finishing doesn't tear down the pool under the others.
+    `close_shared_transport()` does the real close at shutdown.
+    """
+
+    async def __aexit__(self, exc_type=None, exc_value=None, traceback=None) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await super().aclose()
+
+
+_transport: _SharedTransport | None = None
+# URL pattern -> proxy transport, or None for NO_PROXY matches (direct, via `_transport`).
+_proxy_mounts: dict[str, _SharedTransport | None] = {}
+
+
+def shared_transport() -> httpx.AsyncBaseTransport:
+    """Return the process-wide transport, creating it on first use (per worker, after fork)."""
+    global _transport
+    if _transport is None:
+        _transport = _SharedTransport(http2=True, limits=_LIMITS)
+        _proxy_mounts.update({
+            pattern: _SharedTransport(http2=True, limits=_LIMITS, proxy=proxy_url) if proxy_url else None
+            for pattern, proxy_url in get_environment_proxies().items()
+        })
+    return _transport
+
+
+def pooled_client(**kwargs) -> httpx.AsyncClient:
+    """An `httpx.AsyncClient` with its own cookies/headers, backed by the shared pool."""
+    transport = shared_transport()
+    return httpx.AsyncClient(transport=transport, mounts=_proxy_mounts or None, **kwargs)
+
+
+async def close_shared_transport() -> None:
+    """Close the pooled connections. Called once from the app lifespan on shutdown."""
+    global _transport
+    if _transport is not None:
+        transports = [_transport, *(t for t in _proxy_mounts.values() if t is not None)]
+        _transport = None
+        _proxy_mounts.clear()
+        for transport in transports:
+            await transport.close()
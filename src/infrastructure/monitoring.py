@@ -264,6 +264,10 @@ def monitor_performance(operation: str):
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
+            # Without a DSN every transaction/breadcrumb below is a no-op; skip
+            # building them (and the f-string messages) on each call.
+            if not sentry_sdk.get_client().is_active():
+                return await func(*args, **kwargs)
             with sentry_sdk.start_transaction(op=operation, name=func.__name__):
                 add_breadcrumb(
                     message=f"Starting {func.__name__}",
@@ -290,6 +294,10 @@ def monitor_performance(operation: str):
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
+            # Without a DSN every transaction/breadcrumb below is a no-op; skip
+            # building them (and the f-string messages) on each call.
+            if not sentry_sdk.get_client().is_active():
+                return func(*args, **kwargs)
             with sentry_sdk.start_transaction(op=operation, name=func.__name__):
                 add_breadcrumb(
                     message=f"Starting {func.__name__}",
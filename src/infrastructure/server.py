@@ -0,0 +1,13 @@
+"""Uvicorn server settings shared by every entrypoint.
+
+`python asgi.py` passes `SERVER_KWARGS` to `uvicorn.run`; Gunicorn runs the
+worker in `gunicorn_worker.py` (see gunicorn.conf.py), so both serve with the
+same settings. Kept free of Gunicorn imports: Gunicorn is Unix-only, and the
+dev server must still start on Windows.
+"""
+
+# Loop and HTTP parser stay on uvicorn's "auto": it already picks uvloop and
+# httptools (installed via uvicorn[standard]) where they exist and falls back to
+# asyncio/h11 elsewhere, e.g. on Windows where uvloop isn't available. The
+# Server header only advertises the stack.
+SERVER_KWARGS = {"server_header": False}
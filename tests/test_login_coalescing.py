@@ -0,0 +1,38 @@
+"""Regression: identical concurrent logins (client retries, double submits) must
+share one run instead of each driving ms-entrance with the same cookie jar — and
+keying them must not choke on cookie jars orjson can't serialize."""
+
+import asyncio
+
+import pytest
+
+from src.application.commands import refresh_token_command as cmd
+from src.application.dtos.refresh_dtos import LoginResponseDto
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_logins_share_one_run(monkeypatch):
+    calls = 0
+    release = asyncio.Event()
+
+    async def fake_login_once(self, command):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return LoginResponseDto(success=True, message="ok")
+
+    monkeypatch.setattr(cmd.LoginHandler, "_login_once", fake_login_once)
+
+    # An integer beyond 64 bits is valid JSON but makes orjson raise.
+    jar = [{"name": "ESTSAUTH", "value": "x", "expires": 10**21}]
+    handler = cmd.LoginHandler()
+    first = asyncio.ensure_future(handler.handle(cmd.LoginCommand(schulnetz_base_url="https://schulnetz.example.ch", session_cookies=jar)))
+    second = asyncio.ensure_future(handler.handle(cmd.LoginCommand(schulnetz_base_url="https://schulnetz.example.ch", session_cookies=list(jar))))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(first, second)
+    await asyncio.sleep(0)
+
+    assert calls == 1, "identical concurrent logins must run once"
+    assert results[0] is results[1]
+    assert not cmd._inflight_logins, "finished runs must not stay in the in-flight map"